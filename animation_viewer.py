@@ -1,15 +1,54 @@
 import sys
+import time
+
+# Wall-clock time before the PyQt6 imports, used by the startup benchmark.
+_PROCESS_START = time.time()
+
+import argparse
+import threading
+import importlib
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QLabel, QFileDialog,
     QVBoxLayout, QWidget, QPushButton, QHBoxLayout
 )
 from PyQt6.QtGui import QPixmap, QAction
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
 from pathlib import Path
 
 
+def preload_decoder():
+    """
+    Import extract_frames (and with it PIL) on a background thread so the
+    first extraction does not pay for it. The window does not wait on this.
+    """
+    thread = threading.Thread(
+        target=importlib.import_module, args=("extract_frames",), daemon=True
+    )
+    thread.start()
+    return thread
+
+
+class ExtractWorker(QThread):
+    """Runs extract_layers off the GUI thread."""
+    extracted = pyqtSignal(str, object)  # output_dir, TemporaryDirectory or None
+    failed = pyqtSignal(str)
+
+    def __init__(self, clip_file, parent=None):
+        super().__init__(parent)
+        self.clip_file = clip_file
+
+    def run(self):
+        try:
+            from extract_frames import extract_layers
+            output_dir, temp_dir_obj = extract_layers(self.clip_file)
+        except Exception as e:
+            self.failed.emit(f"{self.clip_file}: {e}")
+            return
+        self.extracted.emit(output_dir, temp_dir_obj)
+
+
 class AnimationViewer(QMainWindow):
-    def __init__(self):
+    def __init__(self, exit_after_first_frame=False):
         super().__init__()
 
         self.setWindowTitle("CSP Animation Viewer")
@@ -18,9 +57,9 @@ class AnimationViewer(QMainWindow):
         # --- MENU BAR ----------------------------------------------------
         menu_bar = self.menuBar()
         file_menu = menu_bar.addMenu("File")
-        open_action = QAction("Open Clip File...", self)
-        open_action.triggered.connect(self.open_file)
-        file_menu.addAction(open_action)
+        self.open_action = QAction("Open Clip File...", self)
+        self.open_action.triggered.connect(self.open_file)
+        file_menu.addAction(self.open_action)
         exit_action = QAction("Exit", self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
@@ -87,10 +126,16 @@ class AnimationViewer(QMainWindow):
         # Temporary directory holder
         self._temp_dir = None
 
+        # Background extraction
+        self._worker = None
+        self._close_pending = False
+
+        # Startup benchmark: report timings and quit once a frame is painted
+        self.exit_after_first_frame = exit_after_first_frame
+        self._window_shown_at = None
+
     # --- Menu / File Actions -------------------------------------------
     def open_file(self):
-        from extract_frames import extract_layers
-
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Open Clip File",
@@ -99,19 +144,86 @@ class AnimationViewer(QMainWindow):
         )
         if not file_path:
             return
+        self.load_file(file_path)
+
+    def load_file(self, file_path):
+        # extract_layers keeps its options in a module global, so only one
+        # extraction may run at a time; Open is disabled until it finishes.
+        if self._worker is not None:
+            return
+
+        self.image_label.setText(f"Loading {Path(file_path).name}...")
+        self.open_action.setEnabled(False)
+        self._worker = ExtractWorker(file_path, self)
+        self._worker.extracted.connect(self.on_extracted)
+        self._worker.failed.connect(self.on_extract_failed)
+        self._worker.finished.connect(self.on_worker_finished)
+        self._worker.finished.connect(self._worker.deleteLater)
+        self._worker.start()
 
-        output_dir, temp_dir_obj = extract_layers(file_path)
+    def on_worker_finished(self):
+        self._worker = None
+        self.open_action.setEnabled(True)
+        if self._close_pending:
+            QApplication.quit()
+
+    def on_extracted(self, output_dir, temp_dir_obj):
         output_path = Path(output_dir)
         if output_path.exists() and output_path.is_dir():
             self.frames = sorted(output_path.glob("*.png"))
             self.frames = [str(f) for f in self.frames]
         else:
-            print("Output directory does not exist.")
+            self.on_extract_failed(f"output directory {output_dir} does not exist")
             return
 
         self.current_frame = 0
-        self.show_frame()
         self._temp_dir = temp_dir_obj  # keep temp alive
+        if self.frames:
+            self.show_frame()
+        else:
+            self.image_label.setText("No frames found in file")
+
+        if self.exit_after_first_frame:
+            self.report_startup()
+
+    def on_extract_failed(self, message):
+        print(f"Extraction failed: {message}")
+        self.image_label.setText("Could not open file")
+        if self.exit_after_first_frame:
+            self.exit_app(1)
+
+    def exit_app(self, code):
+        # The worker emits before run() returns; let it finish so Qt does not
+        # abort on destroying a running QThread.
+        if self._worker is not None:
+            self._worker.wait()
+        QApplication.exit(code)
+
+    def closeEvent(self, event):
+        # Don't block the GUI thread on a running extraction: hide the window
+        # and quit from on_worker_finished instead.
+        if self._worker is not None:
+            self._close_pending = True
+            self.hide()
+            event.ignore()
+            return
+        super().closeEvent(event)
+
+    def report_startup(self):
+        if not self.frames:
+            print("STARTUP no frames extracted")
+            self.exit_app(1)
+            return
+        # Force the pixmap onto the screen before taking the timestamp.
+        self.image_label.repaint()
+        first_frame_at = time.time()
+        print(
+            f"STARTUP process_start={_PROCESS_START:.6f} "
+            f"window_shown={self._window_shown_at:.6f} "
+            f"first_frame={first_frame_at:.6f}",
+            flush=True
+        )
+        self.exit_app(0)
 
     # --- Playback Functions --------------------------------------------
     def show_frame(self):
@@ -135,6 +247,8 @@ class AnimationViewer(QMainWindow):
     def showEvent(self, event):
         super().showEvent(event)  # call default showEvent
         self.update_toggle_button_position()  # position button correctly at start
+        if self._window_shown_at is None:
+            self._window_shown_at = time.time()
 
     def prev_frame(self):
         if not self.frames:
@@ -183,10 +297,28 @@ class AnimationViewer(QMainWindow):
 
 
 # ------------------------------------------------------------------------
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="CSP Animation Viewer")
+    parser.add_argument("clip_file", nargs="?", help=".clip file to open")
+    parser.add_argument(
+        "--exit-after-first-frame", action="store_true",
+        help="print startup timings and quit once the first frame is painted"
+    )
+    # argv should come from app.arguments(), which has Qt's own options
+    # (-style, -platform, ...) already removed.
+    return parser.parse_args(argv[1:])
+
+
 def main():
     app = QApplication(sys.argv)
-    window = AnimationViewer()
+    args = parse_args(app.arguments())
+    # Overlap the decoder import with building and showing the window.
+    preload_decoder()
+    window = AnimationViewer(exit_after_first_frame=args.exit_after_first_frame)
     window.show()
+    if args.clip_file:
+        # Let the event loop paint the window before extraction starts.
+        QTimer.singleShot(0, lambda: window.load_file(args.clip_file))
     sys.exit(app.exec())
 
 
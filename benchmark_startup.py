@@ -0,0 +1,90 @@
+"""
+Cold-start benchmark for animation_viewer.py.
+
+Launches the viewer with a .clip file and --exit-after-first-frame several
+times and reports how long it took from process launch until the window was
+shown and until the first frame was painted.
+
+    python benchmark_startup.py path/to/file.clip --runs 5 --max-ms 3000
+
+Exits with status 1 when the median time to first frame exceeds --max-ms, so
+it can be used to catch cold-start regressions. On a machine without a
+display, run it with QT_QPA_PLATFORM=offscreen.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+VIEWER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "animation_viewer.py")
+
+
+def run_once(clip_file, timeout):
+    launched_at = time.time()
+    result = subprocess.run(
+        [sys.executable, VIEWER, "--exit-after-first-frame", clip_file],
+        capture_output=True, text=True, timeout=timeout
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"viewer exited with {result.returncode}:\n{result.stdout}{result.stderr}"
+        )
+
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            fields = dict(item.split("=", 1) for item in line.split()[1:])
+            break
+    else:
+        raise RuntimeError(f"no STARTUP line in viewer output:\n{result.stdout}")
+
+    return {
+        "interpreter_ms": (float(fields["process_start"]) - launched_at) * 1000,
+        "window_ms": (float(fields["window_shown"]) - launched_at) * 1000,
+        "first_frame_ms": (float(fields["first_frame"]) - launched_at) * 1000,
+    }
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure viewer cold-start time")
+    parser.add_argument("clip_file", help=".clip file to open")
+    parser.add_argument("--runs", type=positive_int, default=5)
+    parser.add_argument("--timeout", type=float, default=120, help="seconds per run")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="fail if median time to first frame is above this")
+    args = parser.parse_args()
+
+    samples = []
+    for i in range(args.runs):
+        try:
+            sample = run_once(args.clip_file, args.timeout)
+        except subprocess.TimeoutExpired:
+            print(f"FAIL: run {i + 1} did not paint a frame within {args.timeout:g} s")
+            sys.exit(1)
+        except RuntimeError as e:
+            print(f"FAIL: run {i + 1}: {e}")
+            sys.exit(1)
+        samples.append(sample)
+        print(f"run {i + 1}: " + "  ".join(f"{k}={v:.0f}" for k, v in sample.items()))
+
+    print("median: " + "  ".join(
+        f"{k}={statistics.median(s[k] for s in samples):.0f}" for k in samples[0]
+    ))
+
+    median_first_frame = statistics.median(s["first_frame_ms"] for s in samples)
+    if args.max_ms is not None and median_first_frame > args.max_ms:
+        print(f"FAIL: first frame after {median_first_frame:.0f} ms > {args.max_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
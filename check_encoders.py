@@ -0,0 +1,102 @@
+"""
+Round-trip check for the layer encoders in extract_frames.OUTPUT_ENCODERS.
+
+Encodes a small RGBA and L image with every encoder, reads the result back
+and compares the pixels, so changes to the hand-written raw and .npy headers
+are caught.
+
+    python check_encoders.py
+
+Exits with status 1 if any encoder does not round-trip.
+"""
+
+import io
+import ast
+import sys
+import struct
+
+from PIL import Image
+
+from extract_frames import OUTPUT_ENCODERS, RAW_MAGIC
+
+
+def read_png_or_tiff(data):
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    return img.mode, img.size, img.tobytes()
+
+
+def read_raw(data):
+    assert data[:8] == RAW_MAGIC, data[:8]
+    width, height, channels = struct.unpack('<III', data[8:20])
+    mode = {4: 'RGBA', 1: 'L'}[channels]
+    pixels = data[20:]
+    assert len(pixels) == width * height * channels, (len(pixels), width, height, channels)
+    return mode, (width, height), pixels
+
+
+def read_npy(data):
+    assert data[:8] == b'\x93NUMPY\x01\x00', data[:8]
+    header_len, = struct.unpack('<H', data[8:10])
+    assert (10 + header_len) % 64 == 0, header_len
+    header = data[10:10 + header_len].decode('latin1')
+    assert header.endswith('\n'), repr(header)
+    info = ast.literal_eval(header)
+    assert info['descr'] == '|u1' and info['fortran_order'] is False, info
+    shape = info['shape']
+    mode = 'RGBA' if len(shape) == 3 and shape[2] == 4 else 'L'
+    pixels = data[10 + header_len:]
+
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    if numpy is not None:
+        array = numpy.load(io.BytesIO(data))
+        assert array.shape == shape and array.tobytes() == pixels, array.shape
+
+    return mode, (shape[1], shape[0]), pixels
+
+
+READERS = {
+    'png': read_png_or_tiff,
+    'raw': read_raw,
+    'npy': read_npy,
+    'tiff': read_png_or_tiff,
+}
+
+
+def make_test_images():
+    width, height = 37, 19  # odd sizes catch stride and padding mistakes
+    rgba = Image.frombytes(
+        'RGBA', (width, height), bytes((i * 7) % 256 for i in range(width * height * 4))
+    )
+    gray = Image.frombytes(
+        'L', (width, height), bytes((i * 13) % 256 for i in range(width * height))
+    )
+    return [rgba, gray]
+
+
+def main():
+    failures = 0
+    for output_format, (ext, encoder) in OUTPUT_ENCODERS.items():
+        for img in make_test_images():
+            f = io.BytesIO()
+            encoder(img, f, png_compress_level=1)
+            try:
+                mode, size, pixels = READERS[output_format](f.getvalue())
+                assert mode == img.mode, (mode, img.mode)
+                assert size == img.size, (size, img.size)
+                assert pixels == img.tobytes(), "pixel data differs"
+            except Exception as e:
+                failures += 1
+                print(f"FAIL {output_format} (.{ext}) {img.mode}: {e!r}")
+            else:
+                print(f"ok   {output_format} (.{ext}) {img.mode}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
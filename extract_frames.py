@@ -6,6 +6,10 @@ import os
 import sqlite3
 import logging
 import zlib
+import queue
+import struct
+import threading
+import contextlib
 from collections import namedtuple
 from functools import cmp_to_key
 from argparse import Namespace
@@ -143,18 +147,115 @@ def decode_to_img(offscreen_attribute, bitmap_blocks):
                 img.paste(block_result_img, (256*j, 256*i))
     return img
 
+def encode_png(img, f, png_compress_level=1):
+    img.save(f, format='png', compress_level=png_compress_level)
+
+RAW_MAGIC = b'CSPRAW\0\0'
+
+def encode_raw(img, f, **_options):
+    # 8 byte magic, then width, height and channel count as little-endian uint32,
+    # then the pixels row by row (RGBA or L, 8 bits per channel).
+    channels = len(img.getbands())
+    f.write(RAW_MAGIC + struct.pack('<III', img.width, img.height, channels))
+    f.write(img.tobytes())
+
+def encode_npy(img, f, **_options):
+    # .npy version 1.0 written by hand, so numpy is not needed to export.
+    # Loads as uint8 array of shape (height, width, 4) or (height, width).
+    channels = len(img.getbands())
+    shape = (img.height, img.width, channels) if channels > 1 else (img.height, img.width)
+    header = "{'descr': '|u1', 'fortran_order': False, 'shape': %r, }" % (shape,)
+    # magic (6) + version (2) + header length (2) + header + '\n', aligned to 64
+    header += ' ' * (63 - (10 + len(header)) % 64) + '\n'
+    f.write(b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1'))
+    f.write(img.tobytes())
+
+def encode_tiff(img, f, **_options):
+    img.save(f, format='tiff', compression='raw')
+
+# output format name -> (file extension, encoder)
+OUTPUT_ENCODERS = {
+    'png': ('png', encode_png),
+    'raw': ('raw', encode_raw),
+    'npy': ('npy', encode_npy),
+    'tiff': ('tif', encode_tiff),
+}
+
 def decode_layer_to_png(offscreen_attribute, bitmap_blocks):
     img = decode_to_img(offscreen_attribute, bitmap_blocks)
     img_byte_arr = io.BytesIO()
-    img.save(img_byte_arr, format='png', compress_level=1)
+    encode_png(img, img_byte_arr)
     return img_byte_arr.getvalue()
 
-def save_layers_as_png(chunks, out_dir, sqlite_info):
+def write_images_in_background(jobs, encoder, io_workers, **encoder_options):
+    """
+    Encode and write (path, img) pairs from the jobs iterator on io_workers
+    threads, so decoding the next layer overlaps with encoding and writing the
+    previous ones. The queue is bounded to keep few decoded images in memory.
+    """
+    work = queue.Queue(maxsize=2 * io_workers)
+    errors = []
+
+    def writer():
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            if errors:
+                continue # keep draining so the producer never blocks
+            path, img = item
+            opened = False
+            try:
+                with open(path, 'wb') as f:
+                    opened = True
+                    encoder(img, f, **encoder_options)
+            except Exception as e:
+                errors.append(e)
+                if opened:
+                    # don't leave a truncated file behind
+                    with contextlib.suppress(OSError):
+                        os.unlink(path)
+
+    threads = [threading.Thread(target=writer, daemon=True) for _i in range(io_workers)]
+    for t in threads:
+        t.start()
+    try:
+        for path, img in jobs:
+            if errors:
+                break
+            work.put((path, img))
+    finally:
+        for _t in threads:
+            work.put(None)
+        for t in threads:
+            t.join()
+    if errors:
+        raise errors[0]
+
+def check_output_options(output_format, png_compress_level, io_workers):
+    """
+    Validate save_layers options before any file is touched.
+    Returns io_workers with the default filled in.
+    """
+    if output_format not in OUTPUT_ENCODERS:
+        raise ValueError(f"unknown output format '{output_format}', expected one of {', '.join(OUTPUT_ENCODERS)}")
+    if not (0 <= png_compress_level <= 9):
+        raise ValueError(f"png_compress_level must be between 0 and 9, got {png_compress_level}")
+    if io_workers is None:
+        io_workers = min(4, os.cpu_count() or 1)
+    if io_workers < 1:
+        raise ValueError(f"io_workers must be at least 1, got {io_workers}")
+    return io_workers
+
+def save_layers(chunks, out_dir, sqlite_info, output_format='png', png_compress_level=1, io_workers=None):
     #ComicFrameLineMipmap LayerLayerMaskMipmap LayerRenderMipmap ResizableOriginalMipmap TimeLineOriginalMaskMipmap TimeLineOriginalMipmap"
     mipmapinfo_dict = { m.MainId:m for m in sqlite_info.mipmapinfo_sqlite_info }
     mipmap_dict     = { m.MainId:m for m in sqlite_info.mipmap_sqlite_info }
     offscreen_dict  = { m.MainId:m for m in sqlite_info.offscreen_chunks_sqlite_info }
 
+    io_workers = check_output_options(output_format, png_compress_level, io_workers)
+    ext, encoder = OUTPUT_ENCODERS[output_format]
+
     referenced_chunks_data = {}
 
     for l in sqlite_info.layer_sqlite_info:
@@ -168,14 +269,20 @@ def save_layers_as_png(chunks, out_dir, sqlite_info):
                 referenced_chunks_data[external_id] = (external_block_row.Attribute, chunk_info)
                 #offscreen_chunks_sqlite_info.setdefault(external_id, []).append(l.MainId)
 
-    for external_id, (offscreen_attribute, chunk_info) in sorted(referenced_chunks_data.items()):
-        png_data = decode_layer_to_png(offscreen_attribute, chunk_info.bitmap_blocks)
-        chunk_info_filename = chunks[external_id].chunk_info_filename
-        assert chunk_info_filename.endswith('.png')
-        logging.info(os.path.join(out_dir, chunk_info_filename))
-        with open(os.path.join(out_dir, chunk_info_filename), 'wb') as f:
-            f.write(png_data)
-            
+    def decoded_layers():
+        for external_id, (offscreen_attribute, chunk_info) in sorted(referenced_chunks_data.items()):
+            img = decode_to_img(offscreen_attribute, chunk_info.bitmap_blocks)
+            chunk_info_filename = chunks[external_id].chunk_info_filename
+            assert chunk_info_filename.endswith('.png')
+            path = os.path.join(out_dir, chunk_info_filename.removesuffix('.png') + '.' + ext)
+            logging.info(path)
+            yield path, img
+
+    write_images_in_background(decoded_layers(), encoder, io_workers, png_compress_level=png_compress_level)
+
+def save_layers_as_png(chunks, out_dir, sqlite_info):
+    save_layers(chunks, out_dir, sqlite_info, output_format='png')
+
 def parse_chunk_with_blocks(d):
     ii = 0
     block_count1 = 0
@@ -459,7 +566,10 @@ def extract_csp(filename, output_dir=None):
     chunks = extract_csp_chunks_data(file_chunks_list, output_dir, chunk_to_layers, layer_names)
     
     if cmd_args.output_dir:
-        save_layers_as_png(chunks, output_dir, sqlite_info)
+        save_layers(chunks, output_dir, sqlite_info,
+                    output_format=cmd_args.output_format,
+                    png_compress_level=cmd_args.png_compress_level,
+                    io_workers=cmd_args.io_workers)
         #TODO: json with layer structure?..
 
 # Initialize global variable for the command line result object
@@ -468,14 +578,18 @@ cmd_args = None
 import tempfile
 from types import SimpleNamespace
 
-def extract_layers(clip_file, output_dir=None):
+def extract_layers(clip_file, output_dir=None, output_format='png', png_compress_level=1, io_workers=None):
     """
-    Extract layers from a .clip file into PNGs.
+    Extract layers from a .clip file into image files.
     If output_dir is None, uses a temporary folder.
+    output_format selects the encoder from OUTPUT_ENCODERS ('png', 'raw',
+    'npy' or 'tiff'); png_compress_level (0-9) only applies to 'png'.
+    io_workers is the number of encode/write threads (default min(4, cpus)).
     Returns:
-        output_dir (str): folder containing PNGs
-        temp_dir (TemporaryDirectory or None): keep alive while using PNGs
+        output_dir (str): folder containing the extracted images
+        temp_dir (TemporaryDirectory or None): keep alive while using the images
     """
+    io_workers = check_output_options(output_format, png_compress_level, io_workers)
     temp_dir_created = False
     if output_dir is None:
         temp_dir = tempfile.TemporaryDirectory()
@@ -490,7 +604,10 @@ def extract_layers(clip_file, output_dir=None):
         sqlite_file=f"{output_dir}/temp.sqlite",  # temporary sqlite file
         output_dir=output_dir,
         output_psd=False,
-        ignore_zlib_errors=True
+        ignore_zlib_errors=True,
+        output_format=output_format,
+        png_compress_level=png_compress_level,
+        io_workers=io_workers
     )
 
     # Main extraction